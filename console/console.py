@@ -12,6 +12,10 @@ from piety import State
 # used by keymaps, below
 printable = 'a' # proxy in keymaps for all printable characters
 printing_chars = string.printable[:-5] # exclude \t\n\r\v\f at the end
+# frozenset for O(1) membership test in handle_key, instead of string scan.
+# Multicharacter keycodes (esc sequences) all contain an unprintable char,
+# so they were never substring matches in the string version either.
+printing_chars_set = frozenset(printing_chars)
 
 # used by forward word, backward word
 next_word = re.compile(r'\W\w') # Non-word char then word char
@@ -80,7 +84,7 @@ class Console(object):
         self.process_line = (lambda: process_line(self.line))
         self.quit = False # True exits to job control, bypassing application
         self.stopped = (lambda: self.quit or stopped(self.line))
-        self.line = '' # empty line at beginning of cycle
+        self.line = '' # empty line at beginning of cycle, see property below
         self.point = 0 # index into self.line at beginning of cycle
         self.start_col = 1 # index of first col on display, 1-based not 0-based
         self.history = list() # list of previous commands, earliest first
@@ -96,6 +100,20 @@ class Console(object):
         self.inline_yank = True # yank from inline yank_buffer not multiline
         self.n_tab_spaces = n_tab_spaces
 
+    # The line being edited is stored in self._buf, a list of
+    # single-character strings, so inserting or deleting a character at
+    # point is a single O(1) list operation, not a rebuild of the whole
+    # string as with slice-and-concatenate.  The line property joins the
+    # list into a string for all the readers that need one.
+
+    @property
+    def line(self):
+        return ''.join(self._buf)
+
+    @line.setter
+    def line(self, chars):
+        self._buf = list(chars)
+
     # Piety Session switch method requires job has method named resume
     def resume(self, *args, **kwargs):
         self.startup(*args, **kwargs)
@@ -118,24 +136,38 @@ class Console(object):
         handler() blocks, so this can only run one Console instance at a time.
         """
         self.main(*args, **kwargs)
-        while not self.stopped():
-            self.handler() # blocks in self.reader at each character
+        stopped, handler = self.stopped, self.handler # bind methods once
+        while not stopped():
+            handler() # blocks in self.reader at each character
 
     def handle_key(self, keycode):
         'Call this handle_key as handler when keycode is already available'
         # keycode might be single character or a sequence of characters.
         # Printable keys require special-case handling,
         # because their method takes an additional argument: the key itself.
-        if keycode in printing_chars:
-            method = self.keymap()[printable]
-            method(keycode)
-        elif keycode in self.keymap():
-            method = self.keymap()[keycode]
-            method()
-        elif keycode:
-            util.putstr(key.bel) # sound indicates no handler
+        keymap = self.keymap() # call just once per keycode, not per lookup
+        if keycode in printing_chars_set:
+            keymap[printable](keycode)
         else:
-            pass # incomplete or unrecognized keycode, do nothing
+            method = keymap.get(keycode)
+            if method:
+                method()
+            elif keycode:
+                util.putstr(key.bel) # sound indicates no handler
+            else:
+                pass # incomplete or unrecognized keycode, do nothing
+
+    def handle_keys(self, keycodes):
+        """
+        Handle a sequence of keycodes in one call, for bulk paste and for
+        replaying keyboard macros or scripted tests.  Avoids a reader call
+        and a bound method construction for every key.  Each keycode still
+        goes through handle_key, because a keycode (RET for example) can
+        switch keymaps, which must affect the keys that follow it.
+        """
+        handle_key = self.handle_key
+        for keycode in keycodes:
+            handle_key(keycode)
 
     def handler(self):
         """
@@ -149,7 +181,7 @@ class Console(object):
     # These keys have job control fcn only if they are alone at start of line.
     # Otherwise they can invoke edit methods - C_d appears in lineedit_keymap.
     def ctrl_d(self):
-        if self.line == '':
+        if not self._buf:
             self.quit = True
             util.putstr('^D')  # no newline, caller handles it.
             self.stop()
@@ -157,7 +189,7 @@ class Console(object):
             self.delete_char()
 
     def ctrl_z(self):
-        if self.line == '':
+        if not self._buf:
             self.quit = True
             util.putstr('^Z\rStopped') # still in raw mode
             self.stop()
@@ -218,10 +250,11 @@ class Console(object):
         self.quit = False
         self.line = '' # empty line at beginning of cycle
         self.point = 0 # index into self.line at beginning of cycle
-        self.start_col = len(self.prompt())+1 # 1-based indexing, not 0-based
-        display.move_to_column(1) # can't always assume cursor is already here
-        util.putstr(self.prompt() + self.line) # line might be empty
-        self.move_to_point() # might not be end of line
+        prompt = self.prompt() # call it just once, it can depend on app state
+        self.start_col = len(prompt)+1 # 1-based indexing, not 0-based
+        # single write: move to column 1, print prompt, put cursor at point
+        display.refresh_line(1, prompt + self.line,
+                             self.start_col + self.point)
         terminal.set_char_mode() # enter inline editing, exit at restore()
 
     # Command history
@@ -262,19 +295,20 @@ class Console(object):
         self.move_to_point()
 
     def move_end(self):
-        self.point = len(self.line)
+        self.point = len(self._buf)
         self.move_to_point()
 
     def insert_char(self, keycode):
-        self.line = (self.line[:self.point] + keycode +
-                      self.line[self.point:])
+        if self.point == len(self._buf):
+            self._buf.append(keycode) # common case, typing at end of line
+        else:
+            self._buf.insert(self.point, keycode)
         self.point += 1
         display.insert_char(keycode)
 
     def delete_backward_char(self):
         if self.point > 0:
-            self.line = (self.line[:self.point-1] + 
-                            self.line[self.point:])
+            del self._buf[self.point-1]
             self.point -= 1
             display.delete_backward_char()
 
@@ -284,11 +318,12 @@ class Console(object):
             display.backward_char()
 
     def delete_char(self):
-        self.line = (self.line[:self.point] + self.line[self.point+1:])
+        if self.point < len(self._buf):
+            del self._buf[self.point]
         display.delete_char() # point does not change
 
     def forward_char(self):
-        if self.point < len(self.line):
+        if self.point < len(self._buf):
             self.point += 1
             display.forward_char()
 
@@ -319,42 +354,40 @@ class Console(object):
         m = next_word.search(self.line, self.point)
         if m:
             self.inline_yank = True
-            self.yank_buffer = self.line[self.point:m.start()+1]
-            self.line = self.line[:self.point] + self.line[m.start()+1:]
+            self.yank_buffer = ''.join(self._buf[self.point:m.start()+1])
+            del self._buf[self.point:m.start()+1]
             display.delete_nchars(self.point - (m.start()+1))
 
     def kill_line(self):
         'Delete line from point to end-of-line, save in yank buffer'
         self.inline_yank = True
-        killed_segment = self.line[self.point:]
+        killed_segment = ''.join(self._buf[self.point:])
         if killed_segment: # Do not overwrite yank buffer with empty segment
             self.yank_buffer = killed_segment
-        self.line = self.line[:self.point] # point does not change
+        del self._buf[self.point:] # point does not change
         display.kill_line()
 
     def discard(self): # name like gnu readline unix-line-discard
         'Delete line from start-of-line to point'
         self.inline_yank = True
-        killed_segment = self.line[:self.point]
+        killed_segment = ''.join(self._buf[:self.point])
         if killed_segment: # Do not overwrite yank buffer with empty segment
             self.yank_buffer = killed_segment
-        self.line = self.line[self.point:]
-        self.move_beginning() # accounts for prompt, assigns point
-        util.putstr(self.line)
-        display.kill_line() # remove any leftover text past self.line
-        self.move_beginning() # replace cursor again
- 
+        del self._buf[:self.point]
+        self.point = 0
+        # one write: redraw rest of line at start_col, cursor at beginning
+        display.refresh_line(self.start_col, self.line, self.start_col)
+
     def yank(self):
         'Paste (yank) string previously deleted by kill or discard'
-        self.line = (self.line[:self.point] + self.yank_buffer +
-                      self.line[self.point:])
+        self._buf[self.point:self.point] = self.yank_buffer
         self.point += len(self.yank_buffer)
         display.insert_string(self.yank_buffer)
 
     def tab_n(self, n_spaces):
         'Insert n spaces at point'
         spaces = ' ' * n_spaces
-        self.line = self.line[:self.point] + spaces + self.line[self.point:]
+        self._buf[self.point:self.point] = spaces
         self.point += n_spaces
         display.insert_string(spaces)
 
@@ -363,11 +396,9 @@ class Console(object):
         self.tab_n(self.n_tab_spaces)
 
     def refresh(self):
-        'Refresh line'
-        display.move_to_column(self.start_col)
-        util.putstr(self.line)
-        display.kill_line() # remove any leftover text past self.line
-        self.move_to_point()
+        'Refresh line with a single terminal write'
+        display.refresh_line(self.start_col, self.line,
+                             self.start_col + self.point)
 
     def status(self):
         '^T handler, can override this method with custom handlers in subclasses'
@@ -9,8 +9,28 @@ import os.path, re, textwrap
 emptyline = '^\s*$'
 no_match = -99  # must be same as no_match in check.py
 
+# Compiled regexes for search patterns, keyed by the pattern string.
+# Bounded, so a long session of distinct patterns cannot grow it forever.
+_compiled_patterns = dict()
+
+def compiled(pattern):
+    'Return the compiled regex for pattern (a string), cache the result.'
+    cre = _compiled_patterns.get(pattern)
+    if cre is None:
+        if len(_compiled_patterns) > 100:
+            _compiled_patterns.clear()
+        cre = re.compile(pattern)
+        _compiled_patterns[pattern] = cre
+    return cre
+
 class Buffer(object):
     'Text buffer for editors, a list of lines (strings) with state variables.'
+    # All the per-instance variables assigned in __init__.  With __slots__
+    # there is no per-instance __dict__, which shrinks each buffer and
+    # makes every attribute access a fixed-offset load.
+    __slots__ = ('mode', 'readonly', 'name', 'lines', 'dot', 'filename',
+                 'modified', 'mark', 'end_phase', 'fill_column', 'found',
+                 'rev', 'last_search')
     pattern = '' # search string - default '' matches any line
     # assigned by y(ank), that is copy, or d(elete) in current buffer,
     # may be used by x (put, paste) in same or any other buffer
@@ -34,6 +54,8 @@ class Buffer(object):
         self.end_phase = False # control variable used by write method
         self.fill_column = 75 # default, can be reassigned by J parameter
         self.found = False # True when search for Buffer.pattern succeeds
+        self.rev = 0 # revision, counts buffer text modifications
+        self.last_search = None # memo: ((pattern,direction,dot,rev), result, found)
 
     def empty(self):
         'True when buffer is empty (not couting empty line at index 0)'
@@ -43,9 +65,8 @@ class Buffer(object):
         'return string with flags, name, size in lines, mode, filename'
         return (('%' if self.readonly else ' ') +
                 ('*' if self.modified else ' ') +
-                ' %-15s' % self.name + ' %7d' % self.nlines() +
-                '  %-8s' % self.mode + 
-                ' %s' % (self.filename if self.filename else '(no file)'))
+                f' {self.name:<15} {self.nlines():7d}'
+                f'  {self.mode:<8} {self.filename if self.filename else "(no file)"}')
 
     # write method for other programs (besides editors) to write into buffers.
     # print(s, file=buffer)  invokes this method to write s to buffer.
@@ -69,7 +90,7 @@ class Buffer(object):
         Return match object if pattern found in line, None otherwise.
         Named match, but uses re search not match to match anywhere in line.
         """
-        return re.search(pattern, self.lines[iline])
+        return compiled(pattern).search(self.lines[iline])
 
     def lines_precede(self, iline):
         'returns True when more lines precede iline in buffer, False otherwise'
@@ -91,15 +112,29 @@ class Buffer(object):
         if pattern:
             Buffer.pattern = pattern
             self.found = False
+        # repeating a search with the same pattern from the same dot in an
+        # unmodified buffer must give the same answer, so reuse the last one
+        key = (Buffer.pattern, direction, self.dot, self.rev)
+        if self.last_search and self.last_search[0] == key:
+            _, result, self.found = self.last_search
+            return result
+        # The buffer already stores text one line per string, so scan the
+        # lines directly, with the compiled search bound outside the loop.
+        search = compiled(Buffer.pattern).search
+        lines = self.lines
         iline = self.dot + direction if more_lines(self.dot) else self.dot
-        while not self.match(Buffer.pattern, iline) and more_lines(iline):
+        m = search(lines[iline])
+        while not m and more_lines(iline):
             iline += direction
-        if self.match(Buffer.pattern, iline):
+            m = search(lines[iline])
+        if m:
             self.found = True
-            return iline
-        else: 
+            result = iline
+        else:
             self.found = False
-            return no_match
+            result = no_match
+        self.last_search = (key, result, self.found)
+        return result
                      
     def F(self, pattern):
         """
@@ -158,6 +193,7 @@ class Buffer(object):
         self.lines[iline:iline] = lines # sic, insert lines at this position
         nlines = len(lines)
         self.dot = iline + nlines - 1
+        self.rev += 1
         self.modified = True # usually the right thing but ed.B .E override it.
         # adjust line numbers for marks below the insertion point
         for c in self.mark:
@@ -173,6 +209,7 @@ class Buffer(object):
             old_line  = self.lines[iline]
             self.lines[iline] = line
             if not (line == old_line):
+                self.rev += 1
                 self.modified = True
 
     # files
@@ -187,10 +224,10 @@ class Buffer(object):
         Return file_found, False if not found, creating new file.
         """
         if os.path.isfile(filename):
-            strings = [] # in case readlines fails
+            # Read the whole file in one request and split it in C,
+            # instead of iterating the line-at-a-time text I/O path.
             with open(filename, mode='r') as fd:
-                # fd.readlines reads file into a list of strings, one per line
-                strings = fd.readlines() # each string in lines ends with \n
+                strings = fd.read().splitlines(keepends=True)
             self.insert(iline+1, strings) # like append, below
             file_found = True
         else:
@@ -235,6 +272,7 @@ class Buffer(object):
         if yank:
             self.y(start, end) # yank (copy, do not remove) lines to cut buffer
         self.lines[start:end+1] = [] # ed range is inclusive, unlike Python
+        self.rev += 1
         self.modified = True
         if self.lines[1:]: # retain empty line 0
             # first line after deletes, or last line in buffer
@@ -291,10 +329,12 @@ class Buffer(object):
     def I(self, start, end, indent):
         'Indent lines, add indent leading spaces'
         self.lines[start:end+1] = [ ' '*indent + l for l in self.lines[start:end+1]]
+        self.rev += 1
 
     def M(self, start, end, outdent):
         'Outdent lines, remove leading outdent chars'
         self.lines[start:end+1] = [ l[outdent:] for l in self.lines[start:end+1]]
+        self.rev += 1
 
     def s(self, start, end, old, new, glbl, use_regex):
         """
@@ -307,13 +347,16 @@ class Buffer(object):
         """
         if not use_regex:
             old = re.escape(old)
+        cre = compiled(old) # cached, repeating a substitution recompiles nothing
         match = False
-        for i in range(start,end+1): # ed range is inclusive, unlike Python
-            if self.match(old, i):
+        # iterate over one slice instead of indexing each line separately
+        for i, line in enumerate(self.lines[start:end+1], start):
+            if cre.search(line): # ed range is inclusive, unlike Python
                 match = True
                 self.y(i,i) # Cut buf only holds last line where subst, like GNU ed
-                self.lines[i] = re.sub(old, new, self.lines[i])
+                self.lines[i] = cre.sub(new, line)
                 self.dot = i
+                self.rev += 1
                 self.modified = True
         return match
 
@@ -25,19 +25,27 @@ def mk_range(buf, start, end):
 
 def iline_ok(buf, iline):
     'Return True if iline address is in buffer, always False for empty buffer'
-    return isinstance(iline, int) and (0 < iline <= buf.nlines()) 
+    return type(iline) is int and (0 < iline <= buf.nlines())
 
 def iline_ok0(buf, iline):
     'Return True if iline address is in buffer, or buffer is empty'
-    return isinstance(iline, int) and (0 <= iline <= buf.nlines())
+    return type(iline) is int and (0 <= iline <= buf.nlines())
 
 def range_ok(buf, start, end):
     'Return True if start and end are in buffer, and start does not follow end'
     return iline_ok(buf, start) and iline_ok(buf, end) and start <= end
 
-# The following functions check arguments, replace missing args with defaults, 
+# The following functions check arguments, replace missing args with defaults,
 # and print error messages.
 
+def address_error(*ilines):
+    """
+    Print the error message for addresses that fail validation:
+    ? no match when any address is the failed-search code, otherwise
+    ? invalid address.  Shared by ed.py commands and the checks below.
+    """
+    print('? no match' if buffer.no_match in ilines else '? invalid address')
+
 def iparam(s, default):
     """
     Return string s converted to int, if s is empty return default
@@ -59,7 +67,7 @@ def line_valid(buf, ok0, args):
     iline = mk_iline(buf, iline)
     valid = iline_ok0(buf, iline) if ok0 else iline_ok(buf, iline)
     if not valid:
-        print('? no match' if iline == buffer.no_match else '? invalid address')
+        address_error(iline)
     return valid, iline, param
 
 def iline_valid(buf, args):
@@ -76,9 +84,7 @@ def irange(buf, args):
     start, end = mk_range(buf, start, end)
     valid = range_ok(buf, start, end)
     if not valid:
-        print('? no match' 
-                if (start == buffer.no_match or end == buffer.no_match)
-                else '? invalid address')
+        address_error(start, end)
     param = param if param is not None else ''
     return valid, start, end, param, param_list
 
@@ -105,7 +105,7 @@ def r(*args):
         if filename:
             nlines0 = text.buf.nlines()
             text.buf.r(iline, filename)
-            print('%s, %d lines' % (filename, text.buf.nlines() - nlines0))
+            print(f'{filename}, {text.buf.nlines() - nlines0} lines')
 
 def E(*args):
     """
@@ -183,7 +183,7 @@ def w(*args):
     filename = current_filename(fname)
     if filename: # if not, current_filename printed error msg
         text.buf.w(filename)
-        print('%s, %d lines' % (filename, text.buf.nlines()))
+        print(f'{filename}, {text.buf.nlines()} lines')
 
 def DD(*args):
     'Delete the named buffer, even if it has unsaved changes'
@@ -195,7 +195,7 @@ def DD(*args):
         print("? Can't delete main buffer")
     else:
         text.delete(name)
-        print('%s, buffer deleted' % name)
+        print(f'{name}, buffer deleted')
 
 D_count = 0 # number of consecutive times D command has been invoked
 
@@ -219,13 +219,15 @@ def A(*args):
     if check.iline_ok0(text.buf, iline): # don't print error message when file is empty
         print(iline)
     else:
-        print('? no match' if iline == text.buffer.no_match else '? invalid address')        
+        check.address_error(iline)
 
 def n(*args):
-    'Print information about all buffers on stdout.'
-    print('CRM Buffer            Lines  Mode     File')  # Current Readonly Modified
-    for name in text.buffers:
-        print(('.' if name == text.current else ' ') + text.info(name))
+    'Print information about all buffers on stdout, with a single write.'
+    current = text.current
+    rows = ['CRM Buffer            Lines  Mode     File'] # Current Readonly Modified
+    for name in text.namelist:
+        rows.append(('.' if name == current else ' ') + text.info(name))
+    sys.stdout.write('\n'.join(rows) + '\n')
 
 def N(*args):
     'Print information about all buffers in *Buffers* buffer.'
@@ -239,17 +241,18 @@ def N(*args):
 # called by l (below), might be called by display code elsewhere
 def l_noprint(*args):
     'Advance dot to iline, return that line'
+    buf = text.buf # bind once, several uses below
     iline, _, _, _ = parse.arguments(args)
-    if not text.buf.lines:
+    if not buf.lines:
         print('? empty buffer')
         return
     # don't use usual default dot here, instead advance dot
     if iline == None:
-        iline = text.buf.dot + 1
-    if not check.iline_ok(text.buf, iline):
-        print('? no match' if iline == text.buffer.no_match else '? invalid address')
+        iline = buf.dot + 1
+    if not check.iline_ok(buf, iline):
+        check.address_error(iline)
         return
-    line, _ = text.buf.l(iline)
+    line, _ = buf.l(iline)
     return line
 
 def l(*args):
@@ -259,11 +262,12 @@ def l(*args):
 
 def p(*args):
     'Unconditionally print lines from start through end, inclusive'
-    valid, start, end, _, _ = check.irange(text.buf, args)
+    buf = text.buf # bind once, several uses below
+    valid, start, end, _, _ = check.irange(buf, args)
     if valid:
-        for iline in range(start, end+1): # +1 because start,end is inclusive
-            line, _ = text.buf.l(iline)
-            print(line)
+        lines = buf.lines[start:end+1] # +1 because start,end inclusive
+        buf.l(end) # advance dot to the last line printed
+        sys.stdout.write('\n'.join(line.rstrip('\n') for line in lines) + '\n')
 
 # Alternative to p_lines (below), might be called by display code elsewhere
 def p_lines_noprint(start, end):
@@ -271,10 +275,13 @@ def p_lines_noprint(start, end):
     _, _ = text.buf.l(end)
     
 def p_lines(start, end):
-    'Print lines start through end, inclusive'
-    for iline in range(start, end+1): # +1 because start,end is inclusive
-        line, _ = text.buf.l(iline)
-        print(line)
+    'Print lines start through end, inclusive, with a single write'
+    if end < start:
+        return
+    buf = text.buf # bind once, several uses below
+    lines = buf.lines[start:end+1] # +1 because start,end is inclusive
+    buf.l(end) # advance dot to the last line printed
+    sys.stdout.write('\n'.join(line.rstrip('\n') for line in lines) + '\n')
 
 npage = 22 # n of lines printed by z command, can be changed by optional param
 
@@ -288,22 +295,23 @@ def z(*args):
      start at iline+npage (preceding iline), leave dot at first line printed.
     """
     global npage
-    valid, iline, npage_string = check.iline_valid(text.buf, args)
+    buf = text.buf # bind once, several uses below
+    valid, iline, npage_string = check.iline_valid(buf, args)
     if valid:
       valid, npage = check.iparam(npage_string, npage)
       if valid:
         if npage >= 0:
             if not args or isinstance(args[0],str): # args[0] might be npage
-                iline = text.buf.dot + 1
+                iline = buf.dot + 1
             end = iline + npage - 1
         else:
             end = iline - 1
             iline += npage # npage negative, go backward
             iline = iline if iline > 0 else 1
-        end = end if end <= text.buf.nlines() else text.buf.nlines()
+        end = min(end, buf.nlines())
         p_lines(iline, end)
         if npage < 0:
-            text.buf.dot = iline
+            buf.dot = iline
 
 # command functions: adding, changing, and deleting text
 
@@ -376,9 +384,10 @@ def s(*args):
     in each line.  Otherwise substitute all occurrences in each line.
     If old is absent, use pattern from most recent search if successsful.
     """
-    valid, start, end, old, params = check.irange(text.buf, args)
+    buf = text.buf # bind once, several uses below
+    valid, start, end, old, params = check.irange(buf, args)
     if valid:
-        if not old and text.buf.found:
+        if not old and buf.found:
             old = text.buffer.Buffer.pattern # most recent successful search
         # params might be [ new, glbl, use_regex ]
         if old and len(params) > 0 and isinstance(params[0],str):
@@ -388,7 +397,7 @@ def s(*args):
             return
         glbl = bool(params[1])
         use_regex = bool(params[2])
-        match = text.buf.s(start, end, old, new, glbl, use_regex)
+        match = buf.s(start, end, old, new, glbl, use_regex)
         if not match:
             print('? no match')
 
@@ -424,7 +433,7 @@ def x(*args):
     iline, _, _, _ = parse.arguments(args)
     iline = check.mk_iline(text.buf, iline)
     if not (0 <= iline <= text.buf.nlines()+1): # allow +y at $ to append to buffer
-        print('? no match' if iline == text.buffer.no_match else '? invalid address')
+        check.address_error(iline)
         return
     text.buf.x(iline)
 
@@ -478,38 +487,45 @@ command_mode = True
 # Called by do_command (below), might be wrapped with display code elsewhere
 def prepare_input_mode(cmd_name, start, end):
     'assign dot to prepare for input mode, where we a(ppend) each line'
+    buf = text.buf # bind once, several uses below
     if cmd_name == 'a':
-        text.buf.dot = start
+        buf.dot = start
     elif cmd_name == 'i': #and start >0: NOT! can insert in empty file
-        text.buf.dot = start - 1 if start > 0 else 0
+        buf.dot = start - 1 if start > 0 else 0
         # so we can a(ppend) instead of i(nsert)
     elif cmd_name == 'c': #c(hange) command deletes changed lines first
-        text.buf.d(start, end) # d updates text.buf.dot, calls frame.delete()
-        text.buf.dot = start - 1 # supercede dot assigned in preceding
+        buf.d(start, end) # d updates buf.dot, calls frame.delete()
+        buf.dot = start - 1 # supercede dot assigned in preceding
     else:
         pass
 
+# Live module namespace used by do_command to dispatch command names.
+# Must be the live globals() dict, not a static copy: textframe.enable()
+# rebinds ed.l and ed.p_lines, and dispatch must see the rebindings.
+_commands = globals()
+
 def do_command(line):
     'Process one line without blocking in ed command mode or input mode'
     global command_mode, prompt, D_count, q_count
-    results = parse.command(text.buf, line)
+    buf = text.buf # bind once; command fcns that switch buffers don't use it
+    results = parse.command(buf, line)
     if results:
         cmd_name, args = results
     else:
         return # parse already printed error message
-    if cmd_name in parse.complete_cmds:
-        globals()[cmd_name](*args) # dict from name (str) to object (fcn)
-    elif cmd_name in parse.input_cmds:
+    if cmd_name in parse.complete_cmd_set:
+        _commands[cmd_name](*args) # dict from name (str) to object (fcn)
+    elif cmd_name in parse.input_cmd_set:
         command_mode = False
         prompt = input_prompt
         # Instead of using text.buf.a i c fcns we handle input mode cmds inline here
         # We add each line to buffer when user types RET at end-of-line,
         # *unlike* in Python API where we pass multiple input lines at once
         start, end, params, _ = parse.arguments(args) # can be int or None
-        start, end = check.mk_range(text.buf, start, end) # int only
-        if not (check.iline_ok0(text.buf, start) if cmd_name in 'ai'
-                else check.range_ok(text.buf, start, end)):
-            print('? no match' if iline == text.buffer.no_match else '? invalid address')            
+        start, end = check.mk_range(buf, start, end) # int only
+        if not (check.iline_ok0(buf, start) if cmd_name in 'ai'
+                else check.range_ok(buf, start, end)):
+            check.address_error(start, end)
             command_mode = True
             prompt = command_prompt
         elif cmd_name in 'aic':
@@ -536,8 +552,11 @@ def add_line(line):
         set_command_mode()
     else:
         # Recall input() returns each line with final \n stripped off,
-        # BUT text.buf.a requires \n at end of each line.
-        text.buf.a(text.buf.dot, line + '\n') # Append new line after dot, advance dot.
+        # BUT the buffer requires \n at end of each line.
+        # Call insert directly - here line is always exactly one line,
+        # no need for the splitlines scan that buf.a does on its string arg.
+        buf = text.buf
+        buf.insert(buf.dot+1, [line + '\n']) # append after dot, advance dot
     return
 
 def process_line(line):
@@ -65,16 +65,17 @@ def do_window_command(paramstring):
 def do_command(line):
     'Process one command line without blocking.'
     line = line.lstrip()
-    paramstring = line[1:].lstrip()
     # try/except ensures we restore display, especially scrolling
     try:
         # Intercept special commands used by frame only, not ed.
+        # Strip the paramstring only in the branches that use it, most
+        # lines go to edo.do_command and never need it.
         if line.startswith('L'):
             L()
         elif line.startswith('h'):
-            do_rescale_command(paramstring)
+            do_rescale_command(line[1:].lstrip())
         elif line.startswith('o'):
-            do_window_command(paramstring)
+            do_window_command(line[1:].lstrip())
         else:
             edo.do_command(line)
     except BaseException as e:
@@ -9,6 +9,7 @@ edo.py - ed + wyshka, ed with command interpreter that also provides python
 import ed, parse, check, pysh, samysh, wyshka, bufimport, shellcmd
 import traceback
 from contextlib import redirect_stdout, redirect_stderr
+from itertools import islice
 
 text = ed.text # so we can use it without ed prefix
 bimport, breload, sh = bufimport.bimport, bufimport.breload, shellcmd.sh
@@ -30,12 +31,15 @@ def X_command(do_command):
         Buffer name is required, default echo is True, default delay is 1 sec.
         """
         if ed.command_mode:
+            buffers = text.buffers # fetch the module attribute just once
             bufname, echo, delay = samysh.params(paramstring)
-            bufname = ed.match_prefix(bufname, text.buffers)
-            if bufname in text.buffers and bufname != text.current:
-                lines = text.lines(bufname)
+            bufname = ed.match_prefix(bufname, buffers)
+            # one .get fetches the buffer and answers the membership test
+            scriptbuf = buffers.get(bufname)
+            if scriptbuf is not None and bufname != text.current:
+                lines = scriptbuf.lines[1:] # copy - script cmds can edit buffers
                 samysh.run_script(do_command, lines, echo=echo, delay=delay)
-            else:                
+            else:
                 print('? buffer name')
     return X
 
@@ -43,6 +47,8 @@ def P(*args):
     'Run Python statements in addressed lines using push'
     valid, start, end, _, _ = check.irange(text.buf, args)
     if valid: # includes start <= end, maybe not so for mark and dot
+        # Slice, not islice: push runs each statement as we go, and the
+        # statements themselves might edit this buffer under the iteration.
         pysh.pushlines(text.buf.lines[start:end+1])
         print('%s, ran lines %d..%d using push' % (text.current, start, end))
 
@@ -50,7 +56,9 @@ def R(*args):
     'Run Python statements in addressed lines using exec'
     valid, start, end, _, _ = check.irange(text.buf, args)
     if valid: # includes start <= end, maybe not so for mark and dot
-        pysh.execlines(text.buf.lines[start:end+1])
+        # islice iterates the lines in place - execlines joins the text
+        # before running any of it, so no copy of the range is needed
+        pysh.execlines(islice(text.buf.lines, start, end+1))
         print('%s, ran lines %d..%d using exec' % (text.current, start, end))
 
 def T(*args):
@@ -61,7 +69,7 @@ def T(*args):
     valid, start, end, _, _ = check.irange(text.buf, args)
     if valid: # includes start <= end, maybe not so for mark and dot
         with redirect_stderr(text.buf), redirect_stdout(text.buf):
-            pysh.pushlines(text.buf.lines[start:end+1])
+            pysh.pushlines(text.buf.lines[start:end+1]) # copy: output edits this buf
     text.buf.a(text.buf.dot, '\n') # Append new empty line and put dot there
 
 def Z(*args):
@@ -71,7 +79,9 @@ def Z(*args):
         sh(text.buf.lines[text.buf.dot].rstrip())
     text.buf.a(text.buf.dot, '\n') # Append new empty line and put dot there
     
-parse.ed_cmds += 'PRTZ' # so parse.command() recognizes new commands
+parse.add_commands('PRTZ') # so parse.command() recognizes new commands
+
+commands = { 'P': P, 'R': R, 'T': T, 'Z': Z } # new commands added here
 
 def do_command(line):
         'Add P, R, T, Z commands to run Python statements'
@@ -80,14 +90,9 @@ def do_command(line):
             cmd_name, args = results
         else:
             return # parse already printed error message
-        if cmd_name == 'R':
-            R(*args)
-        elif cmd_name == 'P':
-            P(*args)
-        elif cmd_name == 'T':
-            T(*args)
-        elif cmd_name == 'Z':
-            Z(*args)
+        command = commands.get(cmd_name)
+        if command:
+            command(*args)
         else:
             ed.do_command(line)
 
@@ -41,6 +41,9 @@ class Console(console.Console):
     def store_line(self):
         'store self.line to line in buffer at dot'
         text.buf.replace(text.buf.dot, self.line + '\n')
+        # Inline editing wrote this display row directly, behind the
+        # window shadow - untrack it so the next update repaints it.
+        frame.win.shadow.pop(frame.win.wline(text.buf.dot), None)
 
     def set_display_mode(self, line):
         'Enter display editing mode.'
@@ -123,7 +126,7 @@ class Console(console.Console):
         If point is not at end of line, delete character under cursor.
         Otherwise join next line to this one.  At end of last line do nothing.
         """
-        if self.point < len(self.line):
+        if self.point < len(self._buf): # avoid joining line just for len
             super().delete_char()
         else:
             self.join_next()
@@ -133,7 +136,7 @@ class Console(console.Console):
             self.store_line()
             text.buf.l(iline)
             self.load_line()
-            self.point = min(jcol, len(self.line))
+            self.point = min(jcol, len(self._buf))
             frame.put_display_cursor()
         if iline == text.buffer.no_match:
             frame.put_message('? no match')
@@ -101,6 +101,9 @@ def command_mode():
     'Switch to ed command mode, ed . while in input mode.'
     global mode
     mode = Mode.command
+    # The '.' that ended input mode was echoed on the open line behind
+    # the shadow's back - untrack that row so render_from repaints it.
+    win.shadow.pop(win.wline(win.buf.dot) + 1, None)
     # Overwrite '.' line on display, and lines below.
     win.render_from(win.buf.dot + 1)
     win.set_marker(win.buf.dot)
@@ -119,15 +122,19 @@ def refresh():
     """
     Clear, update entire display in command mode, otherwise just the windows.
     """
+    display.begin_sync() # hold output so the repaint appears all at once
     if mode == Mode.command:
         display.put_cursor(1,1)
-        display.erase()
+        display.erase() # screen is now blank, window shadows are stale
+        for w in windows:
+            w.invalidate()
     refresh_windows()
     if mode == Mode.command:
         display.set_scroll(cmd_1, cmd_n)
         put_command_cursor()
     elif mode == Mode.display:
         put_display_cursor()
+    display.end_sync()
 
 def rescale(new_cmd_h):
     """
@@ -166,7 +173,7 @@ def next():
     if mode == Mode.command: # next is available in display mode with ^o
         w0.clear_marker(w0.saved_dot)
     w0.update_status()
-    ifocus = ifocus+1 if ifocus+1 < len(windows) else 0
+    ifocus = (ifocus + 1) % len(windows) # wrap around to first window
     win = windows[ifocus]
     win.focus = True
     win.buf.dot = win.saved_dot
@@ -261,6 +268,9 @@ def insert(buf, start, end):
     buf - buffer where text is inserted
     start, end - line numbers of inserted text after insertion
     """
+    # One insert may repaint several windows; hold output so the whole
+    # round of updates appears at once, not window by window.
+    display.begin_sync()
     if buf == win.buf: # if buffer is the current buffer ...
         if mode != Mode.input: # ed commands m r t y
             win.modify(start, end)
@@ -286,6 +296,7 @@ def insert(buf, start, end):
         put_display_cursor()
     elif mode == Mode.command:
         put_command_cursor()
+    display.end_sync()
 
 def delete(start, end):
     """
@@ -295,6 +306,7 @@ def delete(start, end):
     win.buf.dot may differ from start if we delete end of buffer
     See buffer d() method
     """
+    display.begin_sync() # one frame for all the windows' updates
     win.modify(win.buf.dot, win.buf.dot)
     for w in windows:
         if w.samebuf(win):
@@ -302,6 +314,7 @@ def delete(start, end):
     if mode == Mode.command:
         win.set_marker(win.buf.dot)
         put_command_cursor()
+    display.end_sync()
 
 def mutate(start, end):
     """
@@ -310,6 +323,7 @@ def mutate(start, end):
     end - last line where substitution actually made
     Update all lines in start..end, don't know which lines changed
     """
+    display.begin_sync() # one frame for all the windows' updates
     if mode == Mode.command and win.contains(start):
         win.clear_marker(start)
     win.mutate(start, end)
@@ -322,6 +336,7 @@ def mutate(start, end):
     if mode == Mode.command:
         win.set_marker(win.buf.dot)
         put_command_cursor()
+    display.end_sync()
 
 # Update one or more windows with buffer contents, where the buffer 
 # is explicit, it is a parameter.
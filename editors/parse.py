@@ -8,22 +8,68 @@ complete_cmds = 'AbBdDeEfjIJkKlmnNOpqQrsStuwxyz' # commands that do not use inpu
 input_cmds = 'aci' # commands that use input mode to collect text
 ed_cmds = complete_cmds + input_cmds
 
-# regular expressions for line address forms and other command parts
-number = re.compile(r'(\d+)')
-fwdnumber = re.compile(r'\+(\d+)')
-bkdnumber = re.compile(r'\-(\d+)')
-bkdcnumber = re.compile(r'\^(\d+)')
-plusnumber = re.compile(r'(\++)')
-minusnumber = re.compile(r'(\-+)')
-caratnumber = re.compile(r'(\^+)')
-# string search, regexp meta chrs match themselves
-fwdsearch = re.compile(r'/(.*?)/') # non-greedy *? for /text1/,/text2/
-bkdsearch = re.compile(r'\?(.*?)\?')
-# regular expression search, unescaped regexp meta chrs are interpreted
-refwdsearch = re.compile(r'\|(.*?)\|')
-rebkdsearch = re.compile(r'&(.*?)&')
-text = re.compile(r'(.*)') # nonblank
-mark = re.compile(r"'([a-z@])")  # 'c, ed mark with single lc char label or @
+# frozensets of the same commands for O(1) membership tests in dispatch
+complete_cmd_set = frozenset(complete_cmds)
+input_cmd_set = frozenset(input_cmds)
+ed_cmd_set = frozenset(ed_cmds) # all command letters, for O(1) membership
+
+def add_commands(letters):
+    """
+    Add new command letters, so command() recognizes them.
+    For modules like edo.py that extend ed.py with more commands.
+    """
+    global ed_cmds, ed_cmd_set
+    ed_cmds += letters
+    ed_cmd_set = frozenset(ed_cmds)
+
+# All the line address forms merged into one alternation, tried in the
+# same order as the old cascade, so one regex engine call per address.
+# The named group that matched selects the action from address_actions.
+address = re.compile(
+    r'(?P<num>\d+)'              # digits, the line number
+    r'|\+(?P<fwdnum>\d+)'        # +digits, relative line number forward
+    r'|\-(?P<bkdnum>\d+)'        # -digits, relative line number backward
+    r'|\^(?P<bkdcnum>\d+)'       # ^digits, relative line number backward
+    r'|(?P<plus>\++)'            # + or ++ or +++ ...
+    r'|(?P<minus>\-+)'           # - or -- or --- ...
+    r'|(?P<carat>\^+)'           # ^ or ^^ or ^^^ ...
+    # string search, regexp meta chrs match themselves
+    r'|/(?P<fwdsearch>.*?)/'     # /text/ or // - forward search
+    r'|\?(?P<bkdsearch>.*?)\?'   # ?text? or ?? - backward search
+    # regular expression search, unescaped regexp meta chrs are interpreted
+    r'|\|(?P<refwdsearch>.*?)\|' # |text| or || - forward regexp search
+    r'|&(?P<rebkdsearch>.*?)&'   # &text& or && - backward regexp search
+    r"|'(?P<mark>[a-z@])"        # 'c, ed mark with single lc char label or @
+    )
+address_match = address.match
+
+# One-character address prefixes, one dict lookup replaces four
+# compares at the top of line_address.  Each action takes the buffer
+# and the rest of the command string, returns (line number, rest).
+prefix_actions = {
+    '.': lambda buf, rest: (buf.dot, rest),           # current line
+    '$': lambda buf, rest: (buf.nlines(), rest),      # last line
+    ';': lambda buf, rest: (buf.dot, ',$' + rest),    # equivalent to .,$
+    ',': lambda buf, rest: (1, ',$' + rest),          # equivalent to 1,$
+    '%': lambda buf, rest: (1, ',$' + rest),          # equivalent to 1,$
+    }
+
+# The functions that turn the matched text into a line number,
+# keyed by the name of the group that matched.  -9999 is invalid address.
+address_actions = {
+    'num':         lambda buf, found: int(found),
+    'fwdnum':      lambda buf, found: buf.dot + int(found),
+    'bkdnum':      lambda buf, found: buf.dot - int(found),
+    'bkdcnum':     lambda buf, found: buf.dot - int(found),
+    'plus':        lambda buf, found: buf.dot + len(found),
+    'minus':       lambda buf, found: buf.dot - len(found),
+    'carat':       lambda buf, found: buf.dot - len(found),
+    'fwdsearch':   lambda buf, found: buf.F(re.escape(found)),
+    'bkdsearch':   lambda buf, found: buf.R(re.escape(found)),
+    'refwdsearch': lambda buf, found: buf.F(found),
+    'rebkdsearch': lambda buf, found: buf.R(found),
+    'mark':        lambda buf, found: buf.mark.get(found, -9999),
+    }
 
 def line_address(buf, cmd_string):
     """
@@ -31,67 +77,41 @@ def line_address(buf, cmd_string):
      also return rest of cmd_string.
     This is where we convert the various line address forms to line numbers.
     All other code in ed.py and related modules uses line numbers only.
+    The rest must be a string, not an index into cmd_string: the forms
+    ; , % [ and ] work by rewriting the rest of the command, so the caller
+    cannot assume the rest is a suffix of the cmd_string it passed in.
     """
     if cmd_string == '':
         return None, ''
-    if cmd_string[0] == '.': # current line
-        return buf.dot, cmd_string[1:]
-    if cmd_string[0] == '$': # last line
-        return buf.nlines(), cmd_string[1:]
-    if cmd_string[0] == ';': # equivalent to .,$  - current line to end
-        return buf.dot, ',$'+ cmd_string[1:]
-    if cmd_string[0] in ',%': # equivalent to 1,$ - whole buffer
-        return 1, ',$'+ cmd_string[1:]
+    first = cmd_string[0]
+    # No command letter is an address character, so a leading command
+    # letter means no address - skip the prefix checks and the regex.
+    if first in ed_cmd_set or first == '=': # = is the synonym for A
+        return None, cmd_string
+    action = prefix_actions.get(first) # one-character prefixes . $ ; , %
+    if action:
+        return action(buf, cmd_string[1:])
+    # isdecimal, not isdigit: isdigit also accepts characters such as
+    # superscripts that int() rejects; isdecimal matches what \d+ matched
+    if first.isdecimal(): # most common form, skip the regex scan
+        i, n = 1, len(cmd_string)
+        while i < n and cmd_string[i].isdecimal():
+            i += 1
+        return int(cmd_string[:i]), cmd_string[i:]
 
     # These next two cases don't return, instead they proceed to next section
 
-    if cmd_string[0] in '[': # equivalent to '@,- -selection from mark to dot
+    if first == '[': # equivalent to '@,- -selection from mark to dot
         cmd_string = "'@,-" + cmd_string[1:]
 
     # This is a special case, we find two line numbers at once.
-    if cmd_string[0] in ']': # paragraph
+    if first == ']': # paragraph
         cmd_string = "%d,%d" % (buf.para_first(), buf.para_last()) + cmd_string[1:]
 
-    m = number.match(cmd_string) # digits, the line number
-    if m:
-        return int(m.group(1)), cmd_string[m.end():]
-    m = fwdnumber.match(cmd_string) # +digits, relative line number forward
-    if m:
-        return buf.dot + int(m.group(1)), cmd_string[m.end():]
-    m = bkdnumber.match(cmd_string) # -digits, relative line number backward
-    if m:
-        return buf.dot - int(m.group(1)), cmd_string[m.end():]
-    m = bkdcnumber.match(cmd_string) # ^digits, relative line number backward
-    if m:
-        return buf.dot - int(m.group(1)), cmd_string[m.end():]
-    m = plusnumber.match(cmd_string) # + or ++ or +++ ...
+    m = address_match(cmd_string)
     if m:
-        return buf.dot + len(m.group(0)), cmd_string[m.end():]
-    m = minusnumber.match(cmd_string) # digits, the line number
-    if m:
-        return buf.dot - len(m.group(0)), cmd_string[m.end():]
-    m = caratnumber.match(cmd_string) # digits, the line number
-    if m:
-        return buf.dot - len(m.group(0)), cmd_string[m.end():]
-    # string search, regexp meta chrs match themselves
-    m = fwdsearch.match(cmd_string)  # /text/ or // - forward search
-    if m:
-        return buf.F(re.escape(m.group(1))), cmd_string[m.end():]
-    m = bkdsearch.match(cmd_string)  # ?text? or ?? - backward search
-    if m:
-        return buf.R(re.escape(m.group(1))), cmd_string[m.end():]
-    # regular expression search, unescaped regexp meta chrs are interpreted
-    m = refwdsearch.match(cmd_string)  # |text| or || - forward regexp search
-    if m:
-        return buf.F(m.group(1)), cmd_string[m.end():]
-    m = rebkdsearch.match(cmd_string)  # &text& or && - backward regexp search
-    if m:
-        return buf.R(m.group(1)), cmd_string[m.end():]
-    m = mark.match(cmd_string) # 'c mark with single lc char label
-    if m:
-        c = m.group(1)
-        i = buf.mark[c] if c in buf.mark else -9999 # invalid address
-        return i, cmd_string[m.end():]
+        name = m.lastgroup
+        return address_actions[name](buf, m.group(name)), cmd_string[m.end():]
     return None, cmd_string
 
 def command_tokens(buf, cmd_string):
@@ -102,6 +122,16 @@ def command_tokens(buf, cmd_string):
      params - string containing other command parameters
     All are optional except cmd_name, assign None if an item is not present
     """
+    # fast paths for the most frequent interactive commands, no address scan:
+    # bare RET prints the next line, a lone number moves to that line,
+    # and a single command letter has no address and no parameters.
+    if cmd_string == '':
+        return 'l', None, None
+    if cmd_string.isdecimal(): # not isdigit, which passes what int() rejects
+        return 'l', int(cmd_string), None
+    if len(cmd_string) == 1 and cmd_string in ed_cmd_set:
+        return cmd_string, None, None
+
     cmd_name, start, end, params = None, None, None, None
     # look for start addr, optional. if no match start,tail == None,cmd_string
     start, tail = line_address(buf, cmd_string)
@@ -113,7 +143,7 @@ def command_tokens(buf, cmd_string):
                 print('? end address expected at %s' % tail)
                 return 'ERROR', start, end, params
     # look for cmd_string, NOT optional
-    if tail and tail[0] in ed_cmds:
+    if tail and tail[0] in ed_cmd_set:
         cmd_name, params = tail[0], tail[1:].strip()
     # special case command names
     elif tail == '' or tail.isspace():
@@ -129,14 +159,13 @@ def command_tokens(buf, cmd_string):
     # string or regex replace
     if cmd_name == 's':
         args = [ cmd_name, start, end ]
-        largs = params.split('/')  #  s/old/new/g, g optional
-        reargs = params.split('|') #  s|old|new|
-        if len(largs) == 4:
-            return args + largs[1:] + [ False ] # replace literal string
-        elif len(reargs) == 4:
-            return args + reargs[1:] + [ True ] # replace regular expression
-        else:
-            return args # s indicates error
+        #  s/old/new/g replaces literal string, s|old|new| regular expression
+        if params and params[0] in '/|':
+            delim = params[0]  # first char selects delimiter, split just once
+            parts = params.split(delim)
+            if len(parts) == 4:
+                return args + parts[1:] + [ delim == '|' ]
+        return args # s indicates error
 
     # all other commands, no special parameter parsing
     else:
@@ -152,7 +181,7 @@ def command(buf, line):
     if items[0] == 'ERROR':
         return None # parse.command_tokens already printed error message
     else:
-        tokens = tuple([ t for t in items if t != None ])
+        tokens = tuple(t for t in items if t is not None)
     cmd_name, args = tokens[0], tokens[1:]
     return cmd_name, args
 
@@ -165,15 +194,19 @@ def arguments(args):
     text is the first token in the parameter list, str or None if absent
     params is the parameter list, [] if absent.
     """
+    if not args: # no args at all is the most common call, skip all the tests
+        return None, None, None, ()
     # get 2, 1, or 0 optional line numbers from head of args list
-    if len(args) > 1 and isinstance(args[0],int) and isinstance(args[1],int):
-        start, end, params = int(args[0]), int(args[1]), args[2:]
-    elif len(args) > 0 and isinstance(args[0],int):
-        start, end, params = int(args[0]), None, args[1:]
+    # type is int, not isinstance: addresses are always plain ints, and the
+    # exact-type test is one pointer comparison with no subclass check
+    if len(args) > 1 and type(args[0]) is int and type(args[1]) is int:
+        start, end, params = args[0], args[1], args[2:]
+    elif type(args[0]) is int:
+        start, end, params = args[0], None, args[1:]
     else:
         start, end, params = None, None, args
     # get 1 or 0 optional strings and the rest of args list
-    if params and isinstance(params[0], str):
+    if params and type(params[0]) is str:
         text, params = params[0], params[1:]
     else:
         text = None 
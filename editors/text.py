@@ -3,6 +3,7 @@ text.py - Dictionary of text buffers indexed by string buffer names
              for use by ed.py and other text editors.
 """
 
+import sys
 import buffer
 
 # Data structures and variables. Initialize these with create_buf (below)
@@ -11,13 +12,18 @@ buf = None       # current buffer
 previous = str() # name of previous buffer
 current = str()  # name of current buffer
 buffers = dict() # dict from buffer names (strings) to Buffer instances
+namelist = list() # buffer names in creation order, kept by create/delete
 
 # Basic functions that update data structures: create, select, delete
 
 def create(bufname):
     'Create buffer with given name. Replace any existing buffer with same name'
     global previous, current, buf
+    # intern the name: buffer names are dict keys compared on every lookup
+    bufname = sys.intern(bufname)
     buf = buffer.Buffer(bufname)
+    if bufname not in buffers:
+        namelist.append(bufname)
     buffers[bufname] = buf # replace buffers[bufname] if it already exists
     previous = current
     current = bufname
@@ -36,9 +42,9 @@ def delete(bufname):
     global delbuf, previous, current, buf
     delbuf = buffers[bufname]
     del buffers[bufname]
+    namelist.remove(bufname)
     if bufname == current: # current has been deleted, pick new current buffer
-        keys = list(buffers.keys()) # always nonempty due to main
-        current = keys[0]  
+        current = next(iter(buffers)) # always nonempty due to main
         buf = buffers[current]
         previous = current # must reassign previous *after* assign current here
 
@@ -80,6 +86,5 @@ def lines(bufname):
 
 def names():
     'Return list of all the buffer names.'
-    keys = buffers.keys() # returns a dict_keys object, not indexable
-    return list(keys) 
+    return list(namelist) # copy, so caller cannot disturb our bookkeeping
 
@@ -62,7 +62,9 @@ class BufferFrame(buffer_Buffer):
     BufferFrame class derived from Buffer
     wrap Buffer methods that cause display updates.
     """
-      
+    __slots__ = () # no new instance variables, keep the base class savings
+
+
     def __init__(self, name):
         super().__init__(name)
 
@@ -133,3 +135,19 @@ def enable():
     text.delete = delete
     buffer.Buffer = BufferFrame
 
+def disable():
+    """
+    Disable display updates by restoring the unwrapped functions and
+    methods saved above.  Buffers created while enabled remain
+    BufferFrame instances, but their display calls are all guarded by
+    the displaying flag, so assign displaying = False as well.
+    """
+    ed.l = ed_l
+    ed.p_lines = ed_p_lines
+    ed.prepare_input_mode = ed_prepare_input_mode
+    ed.set_command_mode = ed_set_command_mode
+    text.create = text_create
+    text.select = text_select
+    text.delete = text_delete
+    buffer.Buffer = buffer_Buffer
+
@@ -5,14 +5,41 @@ Each window displays a range of lines (a segment) of a text buffer, and
 also includes a final status line with information about its contents.
 """
 
-import display
+from itertools import islice
 
-def clip(iline, first, last):
-    'return iline limited to range first .. last inclusive'
-    return min(max(first, iline), last)
+import display
 
 show_diagnostics = False # on status line - for now, don't show
 
+# Rendered text for displayed lines, keyed by (line, ncols).
+# Bounded, so a long session cannot grow it forever.
+_rendered = dict()
+
+def rendered(line, ncols):
+    'Return line as displayed - no final \\n, truncated - cache the result.'
+    key = (line, ncols)
+    r = _rendered.get(key)
+    if r is None:
+        if len(_rendered) > 512:
+            _rendered.clear()
+        # lines end with at most one \n; one slice drops it and truncates
+        end = len(line) - 1 if line.endswith('\n') else len(line)
+        r = line[:end if end < ncols else ncols]
+        _rendered[key] = r
+    return r
+
+# Padded '(mode)----' status field for each buffer mode.  There are only
+# a handful of modes, so build each field once instead of per keystroke.
+_bufmode_fields = dict()
+
+def bufmode_field(mode):
+    'Return status-line field for buffer mode, like (Text)----'
+    field = _bufmode_fields.get(mode)
+    if field is None:
+        text = '(%s)' % (mode,)
+        field = _bufmode_fields[mode] = text + '-'*(10 - len(text))
+    return field
+
 class Window(object):
     """
     Window class for line-oriented display editors.
@@ -21,6 +48,13 @@ class Window(object):
     May display a marker to indicate dot, the line where commands take effect.
     """
 
+    # All the per-instance variables assigned in __init__ and resize.
+    # As in Buffer, __slots__ drops the per-instance __dict__ and makes
+    # every attribute access in the render path a fixed-offset load.
+    __slots__ = ('focus', 'buf', 'saved_dot', 'btop', 'blast',
+                 'top', 'nlines', 'ncols', 'half', 'wbottom',
+                 'shadow', 'status_fill', 'first', 'nprinted')
+
     nupdates = 0 # diagnostic, optionally show on status line
 
     def __init__(self, buf, top, nlines, ncols):
@@ -48,7 +82,7 @@ class Window(object):
 
     def bottom(self):
         'Line num. on display of bottom line in window (not status line)'
-        return self.top + self.nlines - 1
+        return self.wbottom # cached, only changes in resize
 
     def bbottom(self):
         'Index in buffer of bottom line in window. May exceed buffer size'
@@ -63,26 +97,28 @@ class Window(object):
  
     def statusline(self):
          "Line number on display of window's status line"
-         return self.bottom() + 1
+         return self.wbottom + 1
 
     def near_top(self, iline):
         """
         Line number in buffer iline is in
         top half of segment at beginning of buffer that fits in window.
         """
-        return (iline <= self.nlines//2 or self.buf.nlines() <= self.nlines)
+        return (iline <= self.half or self.buf.nlines() <= self.nlines)
 
     def near_bottom(self, iline):
         """
         Line number in buffer iline is in
         bottom half of segment at end of buffer that fits in window.
         """
-        return (self.buf.nlines() - iline < self.nlines//2 and
-                self.buf.nlines() >= self.nlines)
+        bnlines = self.buf.nlines()
+        return (bnlines - iline < self.half and
+                bnlines >= self.nlines)
  
     def empty_line(self, iline):
         'Line number iline in buffer is empty, or is just \n'
-        return self.buf.lines[iline] in ('','\n')
+        line = self.buf.lines[iline]
+        return not line or line == '\n' # no tuple scan, marker path
 
     def covers(self, iline):
         'Line number iline in buffer is in range of lines covered by window.'
@@ -94,21 +130,18 @@ class Window(object):
         'First character in line iline in buffer, or space if line empty'
         return ' ' if self.empty_line(iline) else self.buf.lines[iline][0]
 
-    def put_marker(self, iline, clear=False):
-        'Set or clear marker on buffer line iline, or top line if buffer empty'
-        display.put_render(self.top if self.buf.empty() else self.wline(iline),
-                           1, self.ch0(iline), 
-                           display.clear if clear else display.white_bg)
-
     # adjust window positions
-                           
+
     def shift(self, nlines):
         """
         Shift segment of buffer displayed in window by nlines (pos or neg)
         but leave its saved_dot unchanged so window contents will appear to 
         scroll when window is updated on display.
         """
-        self.btop = clip(self.btop + nlines, 1, self.buf.nlines())
+        # clip() inlined, this runs for every window on every insert/delete
+        last = self.buf.nlines()
+        btop = self.btop + nlines
+        self.btop = 1 if btop < 1 else last if btop > last else btop
         self.blast = self.blastline()
 
     def translate(self, nlines):
@@ -119,36 +152,96 @@ class Window(object):
         the same when the window is updated on the display.
         """
         self.shift(nlines)
-        self.saved_dot = clip(self.saved_dot + nlines, 1, self.buf.nlines())
+        last = self.buf.nlines()
+        saved_dot = self.saved_dot + nlines
+        self.saved_dot = (1 if saved_dot < 1
+                          else last if saved_dot > last else saved_dot)
 
     # update windows
 
+    def invalidate(self):
+        """
+        Forget what this window believes is on the display, so the next
+        update repaints every line.  Call whenever the display contents
+        change behind the window's back, for example erase on refresh.
+        """
+        self.shadow.clear()
+
     def open_line(self, wiline):
         'Make line empty at line number wiline on display'
         #if self.top <= wiline <= self.top + self.nlines-1: # omit,let it crash
         display.put_cursor(wiline, 1)
         display.kill_whole_line()
+        # Don't record '' - input mode echoes typed text onto this row
+        # behind the shadow's back, so it must stay untracked until the
+        # next render or clear writes it through a tracked path.
+        self.shadow.pop(wiline, None)
 
     def clear_lines(self, first, last):
         """
-        Clear consecutive lines from first through last in window.
-        Cursor must be positioned at first line already.
-        """
+        Clear consecutive lines from first through last in window,
+        skipping lines the shadow shows are already empty on the display.
+        """
+        shadow = self.shadow
+        # locals for names looked up repeatedly in the loop
+        put_cursor, putstr = display.put_cursor, display.putstr
+        # The \n after each erase advances down the screen - issued with
+        # the cursor inside the command scroll region it would scroll the
+        # command history instead.  That cannot happen here because every
+        # run below starts with its own put_cursor to a window row, and
+        # window rows always lie above the scroll region, so the cursor
+        # never enters the region mid-run.  Keep it that way: never write
+        # a run from an assumed cursor position.
+        erase_row = display.el_all + '\n\r'
+        nrows = 0 # pending run of rows to clear
+        run_row = first
         for i in range(first,last+1): # unempty if reached end of buffer
-            display.kill_whole_line()
-            display.next_line()
-
-    def render_lines(self, first, last):
-        """
-        Print lines in buffer numbered first through last.
-        Assumes cursor already positioned at first line.
-        """
-        i = -1
-        for i, line in enumerate(self.buf.lines[first:last+1]):
-            display.putstr(line.rstrip('\n')[:self.ncols]) # truncate
-            display.kill_line()
-            display.next_line()
-        return i+1 # fewer than first:last+1 when at end of buffer
+            if shadow.get(i) != '':
+                if not nrows:
+                    run_row = i
+                nrows += 1
+                shadow[i] = ''
+            elif nrows: # already-clear row ends the run, write it out
+                put_cursor(run_row, 1)
+                putstr(erase_row * nrows)
+                nrows = 0
+        if nrows:
+            put_cursor(run_row, 1)
+            putstr(erase_row * nrows)
+
+    def render_lines(self, first, last, wfirst):
+        """
+        Print lines in buffer numbered first through last at display
+        line wfirst.  The shadow dict records what each display line
+        already shows; lines whose rendered text is unchanged are
+        skipped, each run of changed lines is written with one call.
+        """
+        shadow = self.shadow
+        ncols = self.ncols
+        # locals for names looked up repeatedly in the loop
+        put_cursor, putstr = display.put_cursor, display.putstr
+        el_end = display.el_end
+        nlines = 0
+        segment = [] # pending run of changed lines
+        row = run_row = wfirst
+        # islice iterates the buffer lines in place, no temporary list
+        for line in islice(self.buf.lines, first, last+1):
+            text = rendered(line, ncols) # truncated, cached
+            if shadow.get(row) != text:
+                if not segment:
+                    run_row = row
+                segment.append(text + el_end + '\n\r')
+                shadow[row] = text
+            elif segment: # unchanged line ends the run, write it out
+                put_cursor(run_row, 1)
+                putstr(''.join(segment))
+                segment = []
+            row += 1
+            nlines += 1
+        if segment:
+            put_cursor(run_row, 1)
+            putstr(''.join(segment))
+        return nlines # fewer than first:last+1 when at end of buffer
 
     def update_lines(self, first, iline, last=0):
         """
@@ -156,13 +249,13 @@ class Window(object):
         to bottom of the window, or to line numbered last if arg present.
         Lines come from self.buf starting at its line iline.
         """
-        self.first = first if self.first == 0 else self.first
-        last = last if last else self.bottom()
+        last = last if last else self.wbottom
         blastlinenum = iline + (last - first) # might exceed $ near eob
-        display.put_cursor(first, 1)
-        nprinted = self.render_lines(iline, blastlinenum)
+        nprinted = self.render_lines(iline, blastlinenum, first)
         icursor = first + nprinted
-        self.nprinted += nprinted
+        if show_diagnostics: # skip the bookkeeping when not shown
+            self.first = first if self.first == 0 else self.first
+            self.nprinted += nprinted
         self.clear_lines(icursor, last)
 
     # status line
@@ -172,17 +265,16 @@ class Window(object):
         current = '----.' if self.focus else '-----'
         readonly = '%' if self.buf.readonly else '-'
         modified = '*-     ' if self.buf.modified else '--     '
-        bufname = '%-13s' % self.buf.name
         dot = self.buf.dot if self.focus else self.saved_dot
-        position = (' All ' if self.buf.nlines() <= self.nlines else
+        bnlines = self.buf.nlines() # called for every update, fetch just once
+        position = (' All ' if bnlines <= self.nlines else
                     ' Top ' if self.btop == 1 else
-                    ' Bot ' if self.blast == self.buf.nlines() else
-                    ' %2.0f%% ' % (100*dot/self.buf.nlines()))
-        linenums = '%-14s' % ('L%d/%d ' % (dot, self.buf.nlines()))
-        bufmodetext = '(%s)' % (self.buf.mode,) # 'Text' or 'Python' or ...
-        bufmode = bufmodetext + '-'*(10 - len(bufmodetext))
-        statustext = (current + readonly + modified + bufname + position +
-                      linenums + bufmode)
+                    ' Bot ' if self.blast == bnlines else
+                    ' %2.0f%% ' % (100*dot/bnlines))
+        bufmode = bufmode_field(self.buf.mode) # 'Text' or 'Python' or ...
+        # one f-string builds the line, no intermediate concatenations
+        statustext = (f'{current}{readonly}{modified}{self.buf.name:<13}'
+                      f'{position}{f"L{dot}/{bnlines} ":<14}{bufmode}')
         nstatus = len(statustext)
         if show_diagnostics:
             Window.nupdates += 1 # ensure at least this changes in diagnostics
@@ -193,13 +285,17 @@ class Window(object):
             statustext += '-'*npad + diagnostics
         else: # show + at column 80
             npad79 = 79 - nstatus
-            npad81 = self.ncols - 81
-            statustext += '-'*npad79 + '+' + '-'*npad81
+            statustext += '-'*npad79 + '+' + self.status_fill
         return statustext[:self.ncols+1]
 
     def update_status_line(self, text):
-        'display text on status line with white_bg'
-        display.put_render(self.statusline(), 1, text, display.white_bg)
+        'display text on status line with white_bg, skip if unchanged'
+        row = self.statusline()
+        # the status row is below the rendered lines, so it can share
+        # the shadow dict; skip the write when the text has not changed
+        if self.shadow.get(row) != text:
+            display.put_render(row, 1, text, display.white_bg)
+            self.shadow[row] = text
 
     # Methods called by clients
 
@@ -215,6 +311,14 @@ class Window(object):
         self.top = top
         self.nlines = nlines
         self.ncols = ncols
+        # cached geometry, pure functions of top and nlines
+        self.half = nlines//2
+        self.wbottom = top + nlines - 1
+        # shadow of the display: maps display line number to the text
+        # last rendered there, so updates can skip unchanged lines
+        self.shadow = dict()
+        # dash filler after the + at column 80, same until the next resize
+        self.status_fill = '-' * (ncols - 81) if ncols > 81 else ''
 
     def wline(self, iline):
         'Line number on display of iline in buffer.'
@@ -237,11 +341,20 @@ class Window(object):
 
     def set_marker(self, iline):
         'Set marker on buffer line iline, or top line if buffer empty'
-        self.put_marker(iline)
+        wiline = self.top if self.buf.empty() else self.wline(iline)
+        if not self.top <= wiline <= self.wbottom:
+            return # offscreen, writing would put stray text at the cursor
+        display.put_render(wiline, 1, self.ch0(iline), display.white_bg)
+        # the marker changes the display behind render_lines' back
+        self.shadow.pop(wiline, None)
 
     def clear_marker(self, iline):
         'Clear marker from buffer line iline, or top line if buffer empty'
-        self.put_marker(iline, clear=True)
+        wiline = self.top if self.buf.empty() else self.wline(iline)
+        if not self.top <= wiline <= self.wbottom:
+            return # offscreen, writing would put stray text at the cursor
+        display.put_render(wiline, 1, self.ch0(iline), display.clear)
+        self.shadow.pop(wiline, None)
 
     # adjust window positions
 
@@ -255,7 +368,7 @@ class Window(object):
         elif self.near_bottom(destination):
             self.btop = self.buf.nlines() - (self.nlines - 1) # last page
         else: 
-            self.btop = destination - self.nlines//2 # center dest. in window
+            self.btop = destination - self.half # center dest. in window
         self.blast = self.blastline()
 
     # update windows
@@ -298,10 +411,13 @@ class Window(object):
         Update focus window after some lines in range start..end changed.
         Similar to render_from above, but can be more efficient: can
         update a band of lines within the window, not all the way to bottom.
-        """        
+        """
+        if not self.intersects(start, end): # changes are all offscreen
+            self.update_status()
+            return
         top = max(start, self.btop)
-        self.update_lines(self.wline(top), top, 
-                       last=self.wline(end))
+        self.update_lines(self.wline(top), top,
+                       last=min(self.wline(end), self.wbottom)) # clip to window
         self.update_status()
 
     def mutate(self, start, end):
@@ -324,8 +440,8 @@ class Window(object):
         wdot = self.wline(self.buf.dot) # line on display where dot appears
         if wdot > 0:
             self.clear_marker(self.buf.dot)
-        if wdot >= self.bottom():
-            self.shift(self.nlines//2)
+        if wdot >= self.wbottom:
+            self.shift(self.half)
             wdot = self.wline(self.buf.dot)
             self.update_lines(self.top, self.btop, last=wdot)
         self.open_line(wdot+1)
@@ -350,20 +466,21 @@ class Window(object):
         # buffer was empty before insert
         if self.saved_dot == 0:
             self.saved_dot = self.buf.dot
-            self.update()
+            self.update() # includes update_status
         # window precedes inserted lines
         elif self.blast < start:
-            pass
+            self.update_status() # just line count changed
         # window includes start of inserted lines
         elif self.covers(start):
             # saved_dot follows start of inserted lines
             if self.saved_dot >= start:
                 self.saved_dot = self.saved_dot + nlines
-            self.update(destination=self.saved_dot)
+            self.update(destination=self.saved_dot) # includes update_status
         # window follows inserted lines
-        elif self.btop >= start:
-            self.translate(nlines)
-        self.update_status()
+        else:
+            if self.btop >= start:
+                self.translate(nlines)
+            self.update_status()
 
     def adjust_delete(self, start, end, destination):
         """
@@ -376,7 +493,7 @@ class Window(object):
         nlines = -(end - start + 1) # negative, text below insert moves up
         # window preceded deleted lines
         if self.blast < start:
-            pass
+            self.update_status() # just line count changed
         # window included deleted lines
         elif self.intersects(start, end):
             # saved_dot preceded deleted lines
@@ -388,17 +505,19 @@ class Window(object):
             # saved_dot was in deleted lines
             else:
                 self.saved_dot = destination
-            self.update(destination=self.saved_dot)
+            self.update(destination=self.saved_dot) # includes update_status
         # window followed deleted lines
-        elif self.btop > end:
-            self.translate(nlines)
-        self.update_status()
+        else:
+            if self.btop > end:
+                self.translate(nlines)
+            self.update_status()
 
     # status line
 
     def update_status(self):
         'display status text on status line'
         self.update_status_line(self.status_text())
-        self.first = 0    # diagnostics, reset after each update
-        self.nprinted = 0
+        if show_diagnostics:
+            self.first = 0    # diagnostics, reset after each update
+            self.nprinted = 0
 
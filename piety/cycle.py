@@ -40,8 +40,11 @@ def handler(input):
     manage all the applications that handle the same input 
     as piety.Job instances in a single piety.Session task.
     """
-    if input in schedule:
-        for t in schedule[input]:
+    # One .get instead of a membership test plus an index - and unlike
+    # schedule[input], .get does not create an entry in the defaultdict.
+    tasks = schedule.get(input)
+    if tasks:
+        for t in tasks:
             if t.enabled():
                 t.handler()
     ievent[input] += 1
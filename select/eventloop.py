@@ -1,49 +1,60 @@
 """
 eventloop - An event loop with a run method.
 
-This is a platform-dependent module. It uses the select module, so it
-must run on a Unix-like host OS (including Linux and Mac OS X).  One
-of the select channels is stdin (which I recall does *not* work
-in the Windows version of select).
+This is a platform-dependent module. It uses the selectors module
+(select underneath), so it must run on a Unix-like host OS (including
+Linux and Mac OS X).  One of the selector channels is stdin (which I
+recall does *not* work in the Windows version of select).
 
 This is imported by the piety module, then the piety module shares data, see below
 """
 
-import datetime, select
+import selectors, time
 from cycle import schedule, handler, ievent, timer, start, stop
 import cycle # must use cycle.period, cycle.running, because immutable ...
 
 def adjust_interval(t0, interval):
-    'Adjust timeout to occur after with the same interval despite delay'
-    t1 = datetime.datetime.now()
-    dt = t1 - t0
-    dt_sec = dt.seconds + 0.000001*dt.microseconds
-    interval = interval - dt_sec # should never be negative ...
+    """
+    Adjust timeout to occur after with the same interval despite delay.
+    t0 is a time.monotonic() value: monotonic can't jump with the wall
+    clock, and the difference is a plain float with no datetime objects.
+    """
+    interval = interval - (time.monotonic() - t0) # should never be negative...
     return interval if interval > 0.0 else cycle.period # ... but ...
 
-# Used by select in event loop
-inputs, outputs, exceptions = [],[],[]
+# Registry of inputs waited on in the event loop.  The kernel keeps the
+# interest list between calls, so the loop no longer passes (and the
+# kernel no longer scans) the whole fd list on every iteration the way
+# select.select does.
+# Prefer poll to epoll: a Piety session waits on just a few inputs
+# (stdin and a handful of task fds), where poll's one syscall per wait
+# beats epoll's extra epoll_ctl traffic, and poll has no FD_SETSIZE cap.
+# DefaultSelector covers platforms without poll.
+if hasattr(selectors, 'PollSelector'):
+    selector = selectors.PollSelector()
+else:
+    selector = selectors.DefaultSelector()
 
 # The eventloop API: activate, deactivate, start, stop
 
 def activate(t):
     """
-    Activate task t by adding t.input to eventloop inputs list
+    Activate task t by registering t.input with the eventloop selector.
     This should only be called after task t has been added to schedule.
     """
-    if t.input != timer and t.input not in inputs:
-        inputs.append(t.input)
-        
+    if t.input != timer and t.input not in selector.get_map():
+        selector.register(t.input, selectors.EVENT_READ)
+
 def deactivate(t):
     """
-    De-activate task t by deleting t.input from eventloop inputs list
+    De-activate task t by unregistering t.input from the eventloop selector.
     This should only be called after t has been removed from schedule
     """
     # Only remove t.input when no more tasks in schedule use that input
     if t.input not in schedule:
-        if t.input in inputs:
-            inputs.remove(t.input)
-    
+        if t.input in selector.get_map():
+            selector.unregister(t.input)
+
 def run(nevents=0):
     """
     Run the Piety event loop.
@@ -52,20 +63,36 @@ def run(nevents=0):
      Use default nevents=0 to process until running==False or unhandled exception
     """
     start()
-    maxevents = ievent[timer] + nevents # ievent includes previous calls to run()
+    ticks = ievent[timer] # local mirror, saves a Counter lookup per iteration
+    # With nevents the loop also runs until maxevents ticks; without it,
+    # only while running.  ticks never goes below zero, so maxevents = 0
+    # makes the tick clause always false and folds both cases into one test.
+    maxevents = ticks + nevents if nevents else 0
     interval = cycle.period # timeout interval in seconds
-    while cycle.running or (nevents and ievent[timer] < maxevents):
-        # Python select doesn't assign time remaining to timeout argument
+    # Local names for everything stable the loop touches each iteration.
+    # cycle.running, cycle.period and ievent[timer] must be read through
+    # their modules - stop() and clients reassign them while we run.
+    monotonic, sleep = time.monotonic, time.sleep
+    select_events, registered = selector.select, selector.get_map
+    handle, adjust = handler, adjust_interval
+    while cycle.running or ticks < maxevents:
+        # selector.select doesn't assign time remaining to timeout argument
         # so we have to time it ourselves
-        t0 = datetime.datetime.now()
-        inputready, outputready, exceptready = select.select(inputs, outputs,
-                                                             exceptions, interval)
-        # inputs
-        for fd in inputready:
-            handler(fd)
-            interval = adjust_interval(t0, interval)
+        t0 = monotonic()
+        if registered(): # any inputs registered?
+            events = select_events(interval)
+        else: # timer ticks only - sleep, don't poll an empty fd list
+            sleep(interval)
+            events = ()
+        # inputs - handle the whole ready batch, then adjust the
+        # interval once, not once per ready input
+        if events:
+            for key, mask in events:
+                handle(key.fileobj)
+            interval = adjust(t0, interval)
 
         # periodic timeout if no input
-        if not (inputready or outputready or exceptready): 
-            handler(timer)
+        else:
+            handle(timer) # increments ievent[timer], mirrored by ticks
+            ticks += 1
             interval = cycle.period # if we got here, full interval has elapsed
@@ -23,15 +23,19 @@ def stop():
 
 main_globals = sys.modules['__main__'].__dict__
 
-interpreter = code.InteractiveConsole(locals=main_globals)
+# Created on first push, so importing pysh costs nothing in sessions
+# that never run any Python commands.
+interpreter = None
 
 def push(line):
     'Push one line to Python code.InteractiveConsole interpreter'
-    global continuation, prompt
+    global continuation, prompt, interpreter
     if line == 'exit()': # DON'T exit from underlying Python session ...
         stop() # ... instead assign running variable, can be used by caller
         continuation = False
     else:
+        if interpreter is None:
+            interpreter = code.InteractiveConsole(locals=main_globals)
         continuation = interpreter.push(line) # True if continuation line expected
     prompt = ps2 if continuation else ps1
 
@@ -40,9 +44,10 @@ def push(line):
 # library codeop.py, the comment that begins 'Compile three times: ...'
 
 def pushlines(lines):
-    'Run a sequence of lines in the Python InteractiveConsole using push'
-    for line in lines + ['\n']:
+    'Run lines (any iterable of strings) in InteractiveConsole using push'
+    for line in lines:
         push(line.rstrip('\n')) # remove any terminal \n from line
+    push('') # the extra empty line described above
 
 # execlines does not behave the same as pushlines; it uses builtin exec
 # not InteractiveConsole.  Values of expressions are not printed by default.
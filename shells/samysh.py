@@ -54,6 +54,11 @@ def run_script(do_command, commands, echo=True, delay=1.0):
      do_command executes a single command: a line of text, a keycode, a char...
      delay is in units of seconds, can be a fraction of a second.
     """
+    if not echo and not (delay and delay > 0):
+        # Nothing for the wrapper to do, skip its call overhead per line
+        for command in commands:
+            do_command(command.rstrip('\n')) # remove terminal \n from line
+        return
     # Must define _do_command here, echo and delay might differ on each call.
     _do_command = show_command(do_command=do_command,
                                echo=echo, delay=delay)
@@ -78,10 +83,10 @@ def add_command(command, do_command):
     addresses preceding the command name, as in classic ed commands.
     The command name can be more than one character, unlike in classic ed.
     """
+    name = command.__name__ # fetch once, not twice per command line
     def _do_command(line):
-        if line.startswith(command.__name__):
-            _, _, paramstring = line.partition(command.__name__)
-            command(paramstring.lstrip())
+        if line.startswith(name):
+            command(line[len(name):].lstrip()) # slice, no partition rescan
         else:
             do_command(line)
     return _do_command
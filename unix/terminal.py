@@ -58,16 +58,17 @@ def getchars(n):
 # Test
 
 def main():
-    c = line = ''
+    c = ''
+    chars = [] # accumulate in a list, join once - no quadratic += growth
     set_char_mode() # enter single character more
     putstr('> ')
     while not c == '\r':
         c = getchar()
         putstr(c)
-        line += c
+        chars.append(c)
     set_line_mode() # return to normal mode
     print()
-    print(line)
+    print(''.join(chars))
 
 if __name__ == '__main__':
     main()
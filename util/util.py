@@ -4,12 +4,23 @@ util.py - miscellaneous utilities
           - that are used by modules in more than one directory
 """
 
+import sys
+
+# Flush every write only when stdout is interactive.  When stdout is
+# redirected to a file or pipe, per-write flushes defeat Python's block
+# buffering and cost a syscall per call; let the buffer amortize them.
+try:
+    flush_stdout = sys.stdout.isatty()
+except (AttributeError, ValueError):
+    flush_stdout = True
+
 def putstr(s):
     """
     Print string (can be just one character) on stdout with no
-    formatting (unlike plain Python print).  Flush to force output immediately.
+    formatting (unlike plain Python print).  Flush to force output immediately
+    when stdout is a terminal, so the user sees it right away.
     If you want newline, you must explicitly include it in s.
     Prints to stdout, which may be redirected.
     """
-    print(s, end='', flush=True)
+    print(s, end='', flush=flush_stdout)
 
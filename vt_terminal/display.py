@@ -90,6 +90,13 @@ def backward_char():
 def move_to_column(column):
     putstr(cha % column)
 
+def refresh_line(column, line, point_column):
+    """
+    Redraw line in place with a single terminal write: move to column,
+    write line, erase any leftover text, move cursor to point_column.
+    """
+    putstr(cha % column + line + el_end + cha % point_column)
+
 # line also uses kill_line, defined below
 
 # used by edsel and window, they also use render (above)
@@ -116,6 +123,20 @@ def set_scroll_all():
     'Set scrolling region to entire display'
     putstr(decstbmn)
 
+# Synchronized output (private mode 2026): the terminal holds output
+# between begin_sync and end_sync, then paints it in one frame.
+# Terminals that do not know the mode just ignore these sequences.
+sync_start = csi + '?2026h'
+sync_end = csi + '?2026l'
+
+def begin_sync():
+    'Ask the terminal to hold output until end_sync, to avoid tearing'
+    putstr(sync_start)
+
+def end_sync():
+    'Paint everything written since begin_sync in one frame'
+    putstr(sync_end)
+
 def put_render(line, column, text, *attributes):
     """
     At line, column, print text with attributes